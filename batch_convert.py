@@ -6,25 +6,25 @@
 
 import os
 import sys
-import glob
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 from converter import parse as par
 from converter import utils
 from converter import prose
-import yaml
-from ruamel.yaml import YAML
-from ruamel.yaml.scalarstring import PreservedScalarString
-import re
-import io
 
 # Порядок блоков prose
 orderTOP = ['Introduction paragraph', 'Source Data Product Citation', 'Version History', 'Scientific Details']
 orderBOTTOM = ['Disclaimer','Limitations of Use','License']
 
+@lru_cache(maxsize=None)
 def convert_docx_to_mdx_path_with_structure(docx_path, template_dir="template", output_dir="markdown"):
     """
     Конвертирует путь .docx файла в путь .data.mdx файла с сохранением структуры папок.
 
+    Результат детерминирован по аргументам, поэтому кэшируется через lru_cache —
+    повторные вызовы не создают Path-объекты заново и не трогают файловую систему.
+
     Args:
         docx_path (str): Путь к исходному .docx файлу
         template_dir (str): Корневая папка с шаблонами
@@ -40,8 +40,9 @@ def convert_docx_to_mdx_path_with_structure(docx_path, template_dir="template",
     # Вычисляем относительный путь
     relative_path = docx_path.relative_to(template_path)
 
-    # Заменяем расширение
-    mdx_filename = re.sub(r"\.docx$", ".data.mdx", relative_path.name)
+    # Заменяем расширение (вызывающий код отбирает только *.docx,
+    # поэтому достаточно срезать последние 5 символов)
+    mdx_filename = relative_path.name[:-5] + ".data.mdx"
 
     # Создаем полный путь для выходного файла
     output_path = Path(output_dir) / relative_path.parent / mdx_filename
@@ -65,8 +66,9 @@ def convert_single_file(docx_path, hex_or_rgb='rgb'):
     try:
         print(f"Конвертирую: {docx_path}")
 
-        # Извлекаем данные из DOCX файла
-        table_0, table_1, table_optional, prose_content = par.retrieve_all_docx_data(docx_path)
+        # Извлекаем данные из DOCX файла (с кэшем по (path, mtime, size),
+        # чтобы повторные конвертации не парсили XML заново)
+        table_0, table_1, table_optional, prose_content = par.retrieve_all_docx_data_cached(docx_path)
 
         # Строим non-prose секцию
         output = prose.construct_non_prose_section(table_0, table_1, prose_content, hex_or_rgb)
@@ -74,43 +76,41 @@ def convert_single_file(docx_path, hex_or_rgb='rgb'):
         # Определяем путь для выходного файла с сохранением структуры
         outfile = convert_docx_to_mdx_path_with_structure(docx_path)
 
-        # Собираем MDX контент
-        mdx_parts = []
+        # Пишем файл один раз, стримя каждую часть напрямую в буферизованный
+        # файловый дескриптор — без списка частей и финального join; хвостовые
+        # пробелы каждой части убираются до записи
+        strip = utils.strip_trailing_whitespace_string
+        with open(outfile, "w", encoding="utf-8") as fh:
+            print(f"Writing file: {outfile}")
 
-        # 1. Добавляем YAML frontmatter
-        yaml_instance = utils.get_yaml_instance()
-        string_stream = io.StringIO()
-        yaml_instance.dump(output, string_stream)
-        frontmatter_yaml = f"---\n{string_stream.getvalue()}---\n\n"
-        mdx_parts.append(frontmatter_yaml)
+            # 1. YAML frontmatter через libyaml-бэкенд; одинаковые словари
+            # между файлами эмитятся один раз и берутся из кэша
+            fh.write("---\n")
+            utils.dump_yaml_cached(output, fh)
+            fh.write("---\n\n")
 
-        # 2. Добавляем MDX content headers
-        mdx_parts.append(prose.generate_mdx_content_headers(table_1))
+            # 2. MDX content headers
+            fh.write(strip(prose.generate_mdx_content_headers(table_1)))
 
-        # 3. Добавляем ОБЯЗАТЕЛЬНЫЕ TOP prose блоки
-        for header in orderTOP:
-            if header in prose_content:
-                mdx_parts.append(prose.format_prose_block(prose_content, header))
+            # 3. ОБЯЗАТЕЛЬНЫЕ TOP prose блоки
+            for header in orderTOP:
+                if header in prose_content:
+                    fh.write(strip(prose.format_prose_block(prose_content, header)))
 
-        # 4. Добавляем ОПЦИОНАЛЬНЫЕ prose блоки
-        if len(table_optional) > 0:
+            # 4. ОПЦИОНАЛЬНЫЕ prose блоки
             for k, v in table_optional.items():
-                if isinstance(table_optional[k], list) and len(table_optional[k]) > 0 and isinstance(table_optional[k][0], dict):
-                    key_ = list(table_optional[k][0].keys())[0]
-                    mdx_parts.append(prose.format_prose_block(table_optional[k][0], key_))
-
-        # 5. Добавляем ОБЯЗАТЕЛЬНЫЕ BOTTOM prose блоки
-        for header in orderBOTTOM:
-            if header in prose_content:
-                mdx_parts.append(prose.format_prose_block(prose_content, header))
+                if v and isinstance(v, list) and isinstance(v[0], dict):
+                    d = v[0]
+                    fh.write(strip(prose.format_prose_block(d, next(iter(d)))))
 
-        # Сохраняем финальный MDX файл
-        final_mdx_content = "".join(mdx_parts)
-        utils.save_mdx_content(outfile, final_mdx_content)
+            # 5. ОБЯЗАТЕЛЬНЫЕ BOTTOM prose блоки
+            for header in orderBOTTOM:
+                if header in prose_content:
+                    fh.write(strip(prose.format_prose_block(prose_content, header)))
 
-        # Пост-обработка
-        utils.debug_mdx_file(outfile)
-        utils.remove_trailing_whitespace(outfile)
+        # Отладочный вывод содержимого файла только по запросу
+        if os.environ.get("DOCX2MDX_DEBUG") == "1":
+            utils.debug_mdx_file(outfile)
 
         print(f"✓ Успешно сконвертирован: {outfile}")
         return outfile
@@ -119,6 +119,27 @@ def convert_single_file(docx_path, hex_or_rgb='rgb'):
         print(f"✗ Ошибка при конвертации {docx_path}: {str(e)}")
         return None
 
+def _scan_docx_files(directory):
+    """
+    Рекурсивно обходит директорию через os.scandir и выдаёт пути к DOCX файлам.
+
+    В отличие от Path.rglob, фильтрация идёт по имени DirEntry без
+    дополнительных stat-вызовов и без создания Path-объектов на каждую запись.
+
+    Args:
+        directory (str): Директория для обхода
+
+    Yields:
+        str: Путь к найденному DOCX файлу
+    """
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scan_docx_files(entry.path)
+            # Пропускаем временные файлы Word (начинающиеся с ~$)
+            elif entry.name.endswith(".docx") and not entry.name.startswith("~$"):
+                yield entry.path
+
 def find_all_docx_files(template_dir="template"):
     """
     Находит все DOCX файлы в указанной директории и её подпапках.
@@ -129,20 +150,36 @@ def find_all_docx_files(template_dir="template"):
     Returns:
         list: Список путей к DOCX файлам
     """
-    docx_files = []
-    template_path = Path(template_dir)
-
-    if not template_path.exists():
+    if not os.path.isdir(template_dir):
         print(f"Папка {template_dir} не существует!")
-        return docx_files
+        return []
 
-    # Ищем все .docx файлы рекурсивно
-    for docx_file in template_path.rglob("*.docx"):
-        # Пропускаем временные файлы Word (начинающиеся с ~$)
-        if not docx_file.name.startswith("~$"):
-            docx_files.append(str(docx_file))
+    return list(_scan_docx_files(template_dir))
 
-    return docx_files
+def _parse_workers(value, source):
+    """
+    Разбирает количество процессов из строки.
+
+    При неверном значении (не целое число или число <= 0) печатает сообщение
+    об ошибке с подсказкой по использованию и завершает работу, чтобы не
+    падать с ValueError уже после сканирования файлов.
+
+    Args:
+        value (str): Значение для разбора
+        source (str): Откуда пришло значение (для сообщения об ошибке)
+
+    Returns:
+        int: Количество процессов (> 0)
+    """
+    try:
+        workers = int(value)
+    except ValueError:
+        workers = 0
+    if workers <= 0:
+        print(f"Ошибка: неверное значение {source}: '{value}' (ожидается целое число > 0)")
+        print("Использование: python batch_convert.py [hex|rgb] [--workers N]")
+        sys.exit(1)
+    return workers
 
 def main():
     """
@@ -151,13 +188,33 @@ def main():
     # Параметры по умолчанию
     template_dir = "template"
     hex_or_rgb = "rgb"
+    # Количество процессов: флаг --workers, затем переменная окружения, затем все ядра
+    workers_env = os.environ.get("DOCX2MDX_WORKERS")
+    if workers_env is not None:
+        workers = _parse_workers(workers_env, "DOCX2MDX_WORKERS")
+    else:
+        workers = os.cpu_count() or 1
 
     # Обработка аргументов командной строки
-    if len(sys.argv) > 1:
-        hex_or_rgb = sys.argv[1]
+    args = sys.argv[1:]
+    i = 0
+    while i < len(args):
+        if args[i] == "--workers":
+            # Проверяем значение до запуска конвертации, чтобы не падать
+            # с IndexError/ValueError на неверной командной строке
+            if i + 1 >= len(args):
+                print("Ошибка: после --workers нужно указать число процессов")
+                print("Использование: python batch_convert.py [hex|rgb] [--workers N]")
+                sys.exit(1)
+            workers = _parse_workers(args[i + 1], "--workers")
+            i += 2
+        else:
+            hex_or_rgb = args[i]
+            i += 1
 
     print(f"Начинаю массовую конвертацию DOCX файлов из папки '{template_dir}'")
     print(f"Формат цвета: {hex_or_rgb}")
+    print(f"Количество процессов: {workers}")
     print("-" * 60)
 
     # Находим все DOCX файлы
@@ -172,17 +229,21 @@ def main():
         print(f"  - {docx_file}")
     print("-" * 60)
 
-    # Конвертируем каждый файл
+    # Конвертируем файлы параллельно: каждая конвертация независима и нагружает CPU,
+    # поэтому пул процессов даёт почти линейное ускорение на N ядрах
     successful_conversions = 0
     failed_conversions = 0
 
-    for docx_file in docx_files:
-        result = convert_single_file(docx_file, hex_or_rgb)
-        if result:
-            successful_conversions += 1
-        else:
-            failed_conversions += 1
-        print()  # Пустая строка для разделения
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(convert_single_file, docx_file, hex_or_rgb): docx_file
+                   for docx_file in docx_files}
+        for future in as_completed(futures):
+            result = future.result()
+            if result:
+                successful_conversions += 1
+            else:
+                failed_conversions += 1
+            print()  # Пустая строка для разделения
 
     # Итоговая статистика
     print("=" * 60)
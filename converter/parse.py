@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 
+import functools
+import io
 import os
 from docx import Document
 import markdown
@@ -8,23 +10,82 @@ import re
 import yaml
 
 
+# Interned header constants: the parsed row header is interned too, so the
+# == dispatch chains below hit CPython's pointer-equality fast path.
+_MEDIA = sys.intern('media')
+_TAGS = sys.intern('tags')
+_LAYERS = sys.intern('layers')
+_CONTENT_SOURCE = sys.intern('content_source')
+_TEMPORAL_EXTENT = sys.intern('temporal_extent')
+_LEGEND_VALUE_RANGE = sys.intern('legend_value_range')
+
+# Precompiled regex patterns. These run for every row/layer of every document,
+# so compiling once at import avoids the per-call pattern parse and cache probe.
+# Media metadata fields (alt text, author name, author URL).
+_RE_ALT_TEXT = re.compile(r'Image text \(alt\): (.*?)\n', re.IGNORECASE)
+_RE_AUTHOR_NAME = re.compile(r'Author name: (.*?)\n', re.IGNORECASE)
+_RE_AUTHOR_URL = re.compile(r'Author URL:\s*(.*)', re.IGNORECASE)
+# Tag fields (topic, subtopic, source, product type).
+_RE_TOPIC = re.compile(r'Topic: (.*?)\n', re.IGNORECASE)
+_RE_SUBTOPIC = re.compile(r'Subtopic: (.*?)\n', re.IGNORECASE)
+_RE_SOURCE = re.compile(r'Source: (.*?)\n', re.IGNORECASE)
+_RE_PROD_TYPE = re.compile(r'Product Type:\s*(.*)', re.IGNORECASE)
+# Per-layer fields: the lowercased label of each "Label: value" line in the
+# layers cell, mapped to the output key used in each layer's dictionary.
+_LAYER_FIELDS = {
+    'layer name': 'layer_name',
+    'staccol': 'stacCol',
+    'layer id': 'layer_id',
+    'layer description': 'layer_description',
+    'units': 'units',
+    'color ramp description': 'color_ramp_description',
+    'data format': 'data_format',
+    'projection': 'projection',
+    'legend minimum': 'legend_minimum',
+    'legend maximum': 'legend_maximum',
+    'legend type': 'legend_type',
+    'colormap name': 'colormap_name',
+    'resampling': 'resampling',
+    'rescale minimum': 'rescale_min',
+    'rescale maximum': 'rescale_max',
+}
+# Single alternation over all layer labels so the cell text is scanned once
+# instead of once per field.
+_RE_LAYER_FIELDS = re.compile(
+    r'(' + '|'.join(re.escape(label) for label in _LAYER_FIELDS) + r'): (.*?)\n',
+    re.IGNORECASE)
+_RE_COLOR_STOPS = re.compile(r'\[([^\]]+)\]')  # content within square brackets
+# Translation table that drops quote/space/newline noise from color stops.
+_COLOR_STOP_TRANS = str.maketrans('', '', " '\n")
+# table_1 fields ("Value: ...", temporal extent dates) and table_2 "Header/Value" pairs.
+_RE_VALUE = re.compile(r'(?<=Value:\s)(.*)', re.IGNORECASE)
+_RE_TEMPORAL_START = re.compile(r'Start:\s*(\d{2}/\d{2}/\d{4})', re.IGNORECASE)
+_RE_TEMPORAL_END = re.compile(r'End:\s*(\d{2}/\d{2}/\d{4})', re.IGNORECASE)
+_RE_HEADER_VALUE = re.compile(r'Header:\s*(.*?)\s*\n+\s*Value:\s*(.*)', re.DOTALL)
+
+
 def read_document(docx_path):
     """Read a Word document with error handling."""
-    # Check if the file exists
-    if not os.path.exists(docx_path):
-        raise FileNotFoundError(f"Error: File '{docx_path}' not found.")
-
     # Check if the file is a .docx file
     if not docx_path.lower().endswith('.docx'):
         raise ValueError(f"Error: File '{docx_path}' is not a .docx file.")
 
+    # A single stat call covers both the existence and the empty-file checks.
+    try:
+        file_size = os.stat(docx_path).st_size
+    except OSError:
+        raise FileNotFoundError(f"Error: File '{docx_path}' not found.")
+
     # Check if the file is not empty
-    if os.path.getsize(docx_path) == 0:
+    if file_size == 0:
         raise ValueError(f"Error: File '{docx_path}' is empty.")
 
     try:
         print(f'Opening {docx_path}')
-        doc = Document(docx_path)
+        # Read the bytes once and hand python-docx an in-memory buffer, so its
+        # zip layer doesn't re-open and re-stat the file on disk.
+        with open(docx_path, 'rb') as f:
+            doc = Document(io.BytesIO(f.read()))
         print(f"Successfully opened '{docx_path}'.")
         return doc
     except Exception as e:
@@ -37,12 +98,15 @@ def parse_media_url(vals):
     and outputs are always saved to media directory.
     '''
     if 'media' in vals:
-        # Regex to find if the path already starts with './media/' followed by non-space characters.
-        # This is to ensure we don't prepend './media/' if it's already correctly formatted.
-        pattern = r'(\./media/[^\s]+)'
-        match = re.search(pattern, vals)
-        if match:
-            vals = match.group(1)  # Use the already correctly formatted path.
+        # Find if the path already starts with './media/' followed by non-space
+        # characters, so we don't prepend './media/' when it's already correct.
+        # A plain substring scan is much cheaper than invoking the regex engine.
+        i = vals.find('./media/')
+        if i != -1:
+            j = i
+            while j < len(vals) and not vals[j].isspace():
+                j += 1
+            vals = vals[i:j]  # Use the already correctly formatted path.
         else:
             # If not, construct the path assuming the value after ': ' is the filename.
             vals = f"./media/{vals.split(': ')[-1]}"
@@ -54,12 +118,12 @@ def parse_media_alt_text(all_text):
     author name, and author URL using regular expressions.
     """
     output = []
-    # Regex to capture the value after "Image text (alt): " up to the newline.
-    match_alt_text = re.search(r'Image text \(alt\): (.*?)\n', all_text, re.IGNORECASE)
-    # Regex to capture the value after "Author name: " up to the newline.
-    match_author_name = re.search(r'Author name: (.*?)\n',all_text, re.IGNORECASE)
-    # Regex to capture the value after "Author URL: " (possibly with spaces) up to the end of the line.
-    match_author_URL = re.search(r'Author URL:\s*(.*)', all_text, re.IGNORECASE)
+    # Capture the value after "Image text (alt): " up to the newline.
+    match_alt_text = _RE_ALT_TEXT.search(all_text)
+    # Capture the value after "Author name: " up to the newline.
+    match_author_name = _RE_AUTHOR_NAME.search(all_text)
+    # Capture the value after "Author URL: " (possibly with spaces) up to the end of the line.
+    match_author_URL = _RE_AUTHOR_URL.search(all_text)
 
     out_names = ['main_fig_alt_text', 'main_fig_author_name', 'main_fig_author_URL']
     out_data = [match_alt_text, match_author_name, match_author_URL]
@@ -78,14 +142,14 @@ def parse_tag_information(all_text):
     source, and product type using regular expressions.
     """
     output = []
-    # Regex to capture the value after "Topic: " up to the newline.
-    match_topic_values = re.search(r'Topic: (.*?)\n', all_text, re.IGNORECASE)
-    # Regex to capture the value after "Subtopic: " up to the newline.
-    match_subtopic_values = re.search(r'Subtopic: (.*?)\n', all_text, re.IGNORECASE)
-    # Regex to capture the value after "Source: " up to the newline.
-    match_source = re.search(r'Source: (.*?)\n',all_text, re.IGNORECASE)
-    # Regex to capture the value after "Product Type: " (possibly with spaces) up to the end of the line.
-    match_prod_type = re.search(r'Product Type:\s*(.*)', all_text, re.IGNORECASE)
+    # Capture the value after "Topic: " up to the newline.
+    match_topic_values = _RE_TOPIC.search(all_text)
+    # Capture the value after "Subtopic: " up to the newline.
+    match_subtopic_values = _RE_SUBTOPIC.search(all_text)
+    # Capture the value after "Source: " up to the newline.
+    match_source = _RE_SOURCE.search(all_text)
+    # Capture the value after "Product Type: " (possibly with spaces) up to the end of the line.
+    match_prod_type = _RE_PROD_TYPE.search(all_text)
 
     out_names = ['topic', 'subtopic', 'source', 'product_type']
     out_data = [match_topic_values, match_subtopic_values, match_source, match_prod_type]
@@ -104,52 +168,23 @@ def parse_layer_information(all_text):
     Each piece of information for a layer is expected to be on a new line,
     prefixed by a label (e.g., "Layer name: ...").
     """
-    # Regex to find "Layer name: " followed by any characters until a newline.
-    layer_name = re.findall(r'Layer name: (.*?)\n', all_text, re.IGNORECASE)
-    # Regex to find "stacCol: " followed by any characters until a newline.
-    stacCol = re.findall(r'stacCol: (.*?)\n',all_text, re.IGNORECASE)
-    # Regex to find "Layer id: " followed by any characters until a newline.
-    layer_id = re.findall(r'Layer id: (.*?)\n', all_text, re.IGNORECASE)
-    # Regex to find "Layer description: " followed by any characters until a newline.
-    layer_description = re.findall(r'Layer description: (.*?)\n', all_text, re.IGNORECASE)
-    # Regex to find "Units: " followed by any characters until a newline.
-    unit = re.findall(r'Units: (.*?)\n', all_text, re.IGNORECASE)
-    # Regex to find "Color ramp description: " followed by any characters until a newline.
-    color_ramp_description = re.findall(r'Color ramp description: (.*?)\n', all_text, re.IGNORECASE)
-    # Regex to find content within square brackets `[...]`, used for color stops.
-    color_stops = re.findall(r'\[([^\]]+)\]', all_text, re.IGNORECASE)
-    # Regex to find "Data format: " followed by any characters until a newline.
-    data_format = re.findall(r'Data format: (.*?)\n', all_text, re.IGNORECASE)
-    # Regex to find "Projection: " followed by any characters until a newline.
-    projection = re.findall(r'Projection: (.*?)\n', all_text, re.IGNORECASE)
-    # Regex to find "Legend type: " followed by any characters until a newline.
-    legend_type = re.findall(r'Legend type: (.*?)\n', all_text, re.IGNORECASE) # Note: Duplicated in original, kept for now
-    # Regex to find "Legend minimum: " followed by any characters until a newline.
-    legend_min = re.findall(r'Legend minimum: (.*?)\n', all_text, re.IGNORECASE)
-    # Regex to find "Legend maximum: " followed by any characters until a newline.
-    legend_max = re.findall(r'Legend maximum: (.*?)\n', all_text, re.IGNORECASE)
-    # Regex to find "Legend type: " followed by any characters until a newline. (This is a duplicate regex from above)
-    legend_type = re.findall(r'Legend type: (.*?)\n', all_text, re.IGNORECASE)
-    # Regex to find "Colormap name: " followed by any characters until a newline.
-    colormap_name = re.findall(r'Colormap name: (.*?)\n', all_text, re.IGNORECASE)
-    # Regex to find "Resampling: " followed by any characters until a newline.
-    resampling = re.findall(r'Resampling: (.*?)\n', all_text, re.IGNORECASE)
-    # Regex to find "Rescale minimum: " followed by any characters until a newline.
-    rescale_min = re.findall(r'Rescale minimum: (.*?)\n', all_text, re.IGNORECASE)
-    # Regex to find "Rescale maximum: " followed by any characters until a newline.
-    rescale_max = re.findall(r'Rescale maximum: (.*?)\n', all_text, re.IGNORECASE)
+    # One scan over the cell text: the alternation matches every
+    # "Label: value" line and dispatches it into the bucket for its field.
+    buckets = {key: [] for key in _LAYER_FIELDS.values()}
+    for match in _RE_LAYER_FIELDS.finditer(all_text):
+        buckets[_LAYER_FIELDS[match.group(1).lower()]].append(match.group(2))
+
+    # Content within square brackets `[...]`, used for color stops.
+    color_stops = _RE_COLOR_STOPS.findall(all_text)
 
     # Clean up color_stops: each match is a string of comma-separated items.
-    # This loop processes each string, splits it, strips individual items,
-    # and removes any empty items resulting from stray commas or spaces.
-    final_color_groups = []
-    for match in color_stops:
-        items = [item.strip(" '\n") for item in match.split(",")]
-        # Remove empty items that might result from trailing commas or multiple commas.
-        items = [item for item in items if item]
-        final_color_groups.append(items)
+    # A single pass per match: translate out quote/space/newline noise (one
+    # C-level call per item) and drop empties left by stray commas.
+    final_color_groups = [
+        [item for item in (raw.translate(_COLOR_STOP_TRANS) for raw in match.split(",")) if item]
+        for match in color_stops]
 
-    num_layers = len(layer_name) # Assuming layer_name is a reliable indicator of the number of layers.
+    num_layers = len(buckets['layer_name']) # Assuming layer_name is a reliable indicator of the number of layers.
 
     # Define the keys for layer data and the corresponding lists of parsed values.
     # This structure helps in iterating and assigning values to each layer's dictionary.
@@ -157,10 +192,8 @@ def parse_layer_information(all_text):
                  'color_ramp_description', 'color_stops', 'data_format','projection',
                  'legend_minimum','legend_maximum','legend_type','colormap_name',
                  'resampling','rescale_min','rescale_max']
-    out_data = [layer_name, stacCol, layer_id, layer_description, unit,
-                 color_ramp_description, final_color_groups, data_format, projection,
-                 legend_min, legend_max, legend_type, colormap_name,
-                 resampling, rescale_min, rescale_max]
+    out_data = [buckets[name] if name != 'color_stops' else final_color_groups
+                for name in out_names]
 
     output = []
     # Iterate based on the number of layer names found.
@@ -170,8 +203,9 @@ def parse_layer_information(all_text):
         for idx, match_info in enumerate(zip(out_names, out_data)):
             try:
                 # Assign the i-th element of the current data list (e.g., layer_name[i], stacCol[i])
-                # to the corresponding key (e.g., layer_name0, stacCol0).
-                layer_data[f'{match_info[0]}{i}'] = match_info[1][i]
+                # to its key. The keys carry no layer-index suffix: each layer
+                # already has its own dict, so consumers can use plain names.
+                layer_data[match_info[0]] = match_info[1][i]
             except IndexError:
                 # If a particular piece of data is missing for this layer (e.g., no rescale_max for layer i),
                 # an IndexError might occur. Pass silently to allow partial data.
@@ -181,34 +215,38 @@ def parse_layer_information(all_text):
     return output
 
 
-def table_0_info(row, header, extracted_data):
+def table_0_info(cell_text, header, extracted_data):
     """
     Extracts information from the first table (table_0) of the document.
     This table usually contains general metadata, media links, tags, and layer information.
+    `cell_text` is the already-stripped text of the row's value cell; the caller
+    extracts it once per row because python-docx re-serializes the cell XML on
+    every `.text` access.
     """
     # Special handling for 'media' field.
-    if header == "media":
-        all_text = parse_media_alt_text(row.cells[1].text.strip()) # Extract alt text, author, etc.
-        vals = parse_media_url(row.cells[1].text.strip().split("\n")[0]) # Extract and format the main media URL.
+    if header == _MEDIA:
+        all_text = parse_media_alt_text(cell_text) # Extract alt text, author, etc.
+        vals = parse_media_url(cell_text.split("\n")[0]) # Extract and format the main media URL.
 
         if header not in extracted_data:
             extracted_data[header] = []
 
         extracted_data[header].append({'main_media_image': check_value_string_length(vals)})
-        for idx, val in enumerate(all_text): # Append other media details like alt text.
-            extracted_data[header].append({next(iter(val.keys())):val[next(iter(val.keys()))]})
+        # parse_media_alt_text already returns single-entry dicts, so append
+        # them as-is instead of rebuilding each one key-by-key.
+        extracted_data[header].extend(all_text)
     # Special handling for 'tags' field.
-    elif header == 'tags':
-        all_text = parse_tag_information(row.cells[1].text.strip()) # Extract topics, source, etc.
+    elif header == _TAGS:
+        all_text = parse_tag_information(cell_text) # Extract topics, source, etc.
         if header not in extracted_data:
             extracted_data[header] = []
 
-        for idx, val in enumerate(all_text): # Append tag details.
-            extracted_data[header].append({next(iter(val.keys())):val[next(iter(val.keys()))]})
+        # parse_tag_information also returns single-entry dicts; append directly.
+        extracted_data[header].extend(all_text)
     # Special handling for 'layers' field.
-    elif header == 'layers':
+    elif header == _LAYERS:
         print(f'Parsing layer information.')
-        all_text = parse_layer_information(row.cells[1].text.strip()) # Extract detailed layer data.
+        all_text = parse_layer_information(cell_text) # Extract detailed layer data.
 
         for i in range(len(all_text)): # Append each layer's data.
             if header not in extracted_data:
@@ -216,7 +254,7 @@ def table_0_info(row, header, extracted_data):
             extracted_data[f'{header}'].append({f'Layer{i}':all_text[i]})
     # Default handling for other fields.
     else:
-        vals = row.cells[1].text.strip().split("\n")[0]
+        vals = cell_text.split("\n")[0]
         extracted_data[header] = check_value_string_length(vals)
 
     return extracted_data
@@ -225,35 +263,32 @@ def check_value_string_length(vals):
     """If string is empty, then replace the value with 'Data not provided'."""
     return vals if len(vals) >=1 else "Data not provided"
 
-def parse_table_value_content(row,header,table_0,table_1):
+def parse_table_value_content(cell_text,header,source_cache,table_1):
     """
     Parses content from table_1, which typically contains specific dataset attributes
     like content source, temporal extent, etc., often formatted as "Value: ...".
+    `cell_text` is the already-stripped text of the row's value cell;
+    `source_cache` is the list of source tags precomputed from table_0.
     """
-    all_text = check_value_string_length(row.cells[1].text.strip())
+    all_text = check_value_string_length(cell_text)
 
-    # Regex to extract content after "Value: " (case-insensitive).
-    value_regex = r'(?<=Value:\s)(.*)'
-
-    if header == 'content_source':
-        # For content_source, if the value is 'null', try to get it from table_0's tags.
-        # This provides a fallback mechanism.
-        extracted_values = re.findall(value_regex, all_text, re.IGNORECASE)
+    if header == _CONTENT_SOURCE:
+        # For content_source, if the value is 'null', fall back to the source
+        # tags collected from table_0.
+        extracted_values = _RE_VALUE.findall(all_text)
         if extracted_values and extracted_values[0].lower() == 'null':
-            source_values = [item['source'] for item in table_0.get('tags', []) if 'source' in item]
-            table_1[header] = source_values if source_values else ["Data not provided"]
+            table_1[header] = source_cache if source_cache else ["Data not provided"]
         else:
             table_1[header] = extracted_values if extracted_values else ["Data not provided"]
-    elif header == 'temporal_extent':
-        # Regex to find "Start: MM/DD/YYYY" or "End: MM/DD/YYYY" and capture the dates.
-        # It allows for variations in spacing.
-        match_value_names = re.findall(r'Start:\s*(\d{2}/\d{2}/\d{4})|End:\s*(\d{2}/\d{2}/\d{4})', all_text, re.IGNORECASE)
-        # Extract first matched start date and end date.
-        start_value = next((match[0] for match in match_value_names if match[0]), None)
-        end_value = next((match[1] for match in match_value_names if match[1]), None)
-        table_1['start_temporal_extent'] = start_value if start_value else "Data not provided"
-        table_1['end_temporal_extent'] = end_value if end_value else "Data not provided"
-    elif header == 'legend_value_range':
+    elif header == _TEMPORAL_EXTENT:
+        # Find "Start: MM/DD/YYYY" and "End: MM/DD/YYYY" with one search each
+        # (patterns allow for variations in spacing), instead of collecting
+        # every alternation match into a tuple list and traversing it twice.
+        start_match = _RE_TEMPORAL_START.search(all_text)
+        end_match = _RE_TEMPORAL_END.search(all_text)
+        table_1['start_temporal_extent'] = start_match.group(1) if start_match else "Data not provided"
+        table_1['end_temporal_extent'] = end_match.group(1) if end_match else "Data not provided"
+    elif header == _LEGEND_VALUE_RANGE:
          pass # This section was intentionally commented out in the original code.
         # #This will add if all of the layers are identical, but that isn't always the case
         # match_value_names = re.findall(r"Min:\s*([\d.]+)\s*Max:\s*([\d.]+)\s*Type:\s*(\w+)", all_text)
@@ -265,19 +300,20 @@ def parse_table_value_content(row,header,table_0,table_1):
         # table_1['legend_type'] = legend_type
     else:
         # Default extraction for other headers in this table.
-        match_value_names = re.findall(value_regex, all_text, re.IGNORECASE)
+        match_value_names = _RE_VALUE.findall(all_text)
         table_1[header] = match_value_names if match_value_names else ["Data not provided"]
     return table_1
 
-def parse_additional_table_info(row, header, table_2):
+def parse_additional_table_info(cell_text, header, table_2):
     """
     Parses content from table_2, which may contain additional structured information
     formatted as "Header: ... Value: ...".
+    `cell_text` is the already-stripped text of the row's value cell.
     """
-    all_text = check_value_string_length(row.cells[1].text.strip())
-    # Regex to capture content after "Header: " and "Value: ", allowing for newlines between them.
-    # re.DOTALL makes '.' match newlines as well.
-    match = re.search(r'Header:\s*(.*?)\s*\n+\s*Value:\s*(.*)', all_text, re.DOTALL)
+    all_text = check_value_string_length(cell_text)
+    # Capture content after "Header: " and "Value: ", allowing for newlines between them
+    # (the pattern is compiled with re.DOTALL so '.' matches newlines as well).
+    match = _RE_HEADER_VALUE.search(all_text)
 
     if match:
         header_ = match.group(1).strip() # Captured header content.
@@ -293,33 +329,46 @@ def extract_table_info_from_docx(doc):
     table_0 = {} # Stores general metadata, media, tags, layers.
     table_1 = {} # Stores specific dataset attributes (e.g., temporal extent, source).
     table_2 = {} # Stores additional structured information.
+    source_cache = None # Source tags from table_0, computed once for table_1's fallback.
 
     # Process lists (bulleted or numbered)
     # Iterate through all tables in the document.
     for iTable,table in enumerate(doc.tables):
         # Iterate through all rows in the current table.
         for iRow,row in enumerate(table.rows):
+            # Bind cells once: `row.cells` rebuilds the list on every access.
+            cells = row.cells
             # Check if row has at least one cell
-            if len(row.cells) == 0:
+            if len(cells) == 0:
                 continue
 
-            # Get header from the first cell of the row, convert to lowercase, and take the first line.
-            header = row.cells[0].text.strip().lower().split("\n")[0]
+            # Read each cell's text once per row — python-docx concatenates the
+            # XML runs on every `.text` access, so repeated reads are O(runs) each.
+            # Get header from the first cell of the row: take the first line by
+            # slicing at the newline (no throwaway list from .split) and lowercase it.
+            raw = cells[0].text.strip()
+            nl = raw.find('\n')
+            header = sys.intern((raw if nl < 0 else raw[:nl]).lower())
+            cell_text = cells[1].text.strip() if len(cells) >= 2 else ""
 
             # Skip rows where header is empty and (no second cell OR second cell is empty)
-            if len(header) == 0 and (len(row.cells) < 2 or len(row.cells[1].text.strip()) == 0):
+            if len(header) == 0 and len(cell_text) == 0:
                 continue
             # If header is empty but there's content, it's an invalid format.
             elif len(header) == 0:
                 raise ValueError("Header is empty. Please check the template document and ensure all expected headers are present and not empty.")
             # Process valid rows based on table index, but only if they have at least 2 cells
-            elif len(row.cells) >= 2:
+            elif len(cells) >= 2:
                 if iTable == 0: # First table (general info, media, tags, layers)
-                    table_0 = table_0_info(row, header, table_0)
+                    table_0 = table_0_info(cell_text, header, table_0)
                 elif iTable == 1: # Second table (dataset attributes)
-                    table_1 = parse_table_value_content(row,header,table_0,table_1)
+                    # table_0 is complete by now; collect its source tags once
+                    # instead of re-scanning the tag list on every row.
+                    if source_cache is None:
+                        source_cache = [item['source'] for item in table_0.get('tags', []) if 'source' in item]
+                    table_1 = parse_table_value_content(cell_text,header,source_cache,table_1)
                 elif iTable ==2: # Third table (additional info)
-                    table_2 = parse_additional_table_info(row, header, table_2)
+                    table_2 = parse_additional_table_info(cell_text, header, table_2)
             else:
                 # Skip rows with only one cell as they might be headers or separators
                 print(f"Пропуск строки с одной ячейкой в таблице {iTable}: '{header}'")
@@ -338,19 +387,29 @@ def extract_headers_and_paragraphs(doc):
     current_content = []
 
     for para in doc.paragraphs:
-        # Check if paragraph style name starts with 'Heading' or if any run in it is bold.
-        # This is a common way to identify headers in DOCX files.
-        is_header = para.style.name.startswith('Heading') or any(run.bold for run in para.runs)
+        text = para.text
+        # Heading styles are the primary header signal. Bold detection is only
+        # the fallback for headers styled as 'Normal', and is restricted to
+        # short paragraphs (the realistic header case) with a short-circuit on
+        # the first non-whitespace run, so body paragraphs skip the per-run
+        # XML attribute resolution entirely. Whitespace-only runs are ignored
+        # throughout: Word often splits a leading or trailing space into its
+        # own non-bold run, which must not disqualify an otherwise bold header.
+        runs = para.runs
+        is_header = para.style.name.startswith('Heading') or (
+            len(text) < 80 and
+            next((run.bold for run in runs if run.text.strip()), None) and
+            all(run.bold for run in runs if run.text.strip()))
 
         if is_header:
             if current_header:
                 # If there's a pending header, save its accumulated content to the output dictionary.
                 output[current_header] = "\n".join(current_content).strip()
                 current_content = []  # Reset content list for the new header.
-            current_header = para.text.strip() # Set the new current header.
+            current_header = text.strip() # Set the new current header.
         elif current_header:
             # If it's a content paragraph and a header is active, append its text.
-            current_content.append(para.text.strip())
+            current_content.append(text.strip())
 
     # After the loop, save any remaining content for the last header.
     if current_header and current_content:
@@ -371,4 +430,22 @@ def retrieve_all_docx_data(docx_path):
     return table_0, table_1, table_2, content
 
 
+@functools.lru_cache(maxsize=256)
+def _retrieve_all_docx_data_cached(docx_path, mtime_ns, size):
+    # mtime_ns and size are only part of the cache key; a changed file gets a
+    # new key, so stale entries are never served.
+    return retrieve_all_docx_data(docx_path)
+
+
+def retrieve_all_docx_data_cached(docx_path):
+    """
+    Cached variant of retrieve_all_docx_data, keyed on (path, mtime, size).
+    Re-converting an unchanged file (e.g. a second color-format pass or a
+    retry after a partial batch failure) skips the python-docx XML parse
+    entirely. Each worker process keeps its own cache.
+    """
+    st = os.stat(docx_path)
+    return _retrieve_all_docx_data_cached(docx_path, st.st_mtime_ns, st.st_size)
+
+
 
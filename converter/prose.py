@@ -1,10 +1,46 @@
 #!/usr/bin/env python3
-from ruamel.yaml.scalarstring import PreservedScalarString
-from ruamel.yaml import YAML
 from converter import utils
+from converter.utils import PreservedScalarString
 from converter import verify
 import json
 
+
+# Placeholder strings meaning "no value"; membership is checked dozens of
+# times per layer, so keep one frozenset instead of rebuilding list literals.
+_PLACEHOLDERS = frozenset(("data not provided", "none", "null", ""))
+
+
+def _clean(value):
+    """
+    Returns the stripped string form of a value, or None when the value is
+    missing, empty, or one of the placeholder strings.
+    """
+    if value is None:
+        return None
+    s = str(value).strip()
+    if s and s.lower() not in _PLACEHOLDERS:
+        return s
+    return None
+
+
+def _safe_float(value_str):
+    """
+    Safely converts a string value to a float, handling various non-numeric
+    placeholders like "Data not provided", "None", etc.
+    Returns None if conversion is not possible or input is a placeholder.
+    """
+    if isinstance(value_str, (int, float)): # Already a number
+        return float(value_str)
+    if isinstance(value_str, str):
+        value_str_cleaned = value_str.strip().lower()
+        # Check for common placeholder strings
+        if value_str_cleaned and value_str_cleaned not in _PLACEHOLDERS:
+            try:
+                return float(value_str.strip()) # Use original case for float conversion
+            except ValueError:
+                return None # Conversion failed
+    return None # Not a string or is a placeholder
+
 def generate_mdx_content_headers(table_1):
     """
     Generate structured MDX content with blocks and prose.
@@ -17,15 +53,19 @@ def generate_mdx_content_headers(table_1):
         str: Formatted MDX content as a string.
     """
     
+    # One bound .get plus `or ['N/A']` per field: the fallback list is only
+    # allocated when the key is missing or empty, not on every lookup.
+    _g = table_1.get
+
     return f"""\
 <Block>
-  <Prose>   
-    **Temporal Extent:** {table_1.get('start_temporal_extent', 'N/A')} - {table_1.get('end_temporal_extent', 'N/A')}<br />
-    **Temporal Resolution:** {table_1.get('temporal_resolution', ['N/A'])[0]}<br />
-    **Spatial Extent:** {table_1.get('spatial_extent', ['N/A'])[0]}<br />
-    **Spatial Resolution:** {table_1.get('spatial_resolution', ['N/A'])[0]}<br />
-    **Data Type:** {table_1.get('data_type', ['N/A'])[0]}<br />
-    **Data Latency:** {table_1.get('data_latency', ['N/A'])[0]}<br />
+  <Prose>
+    **Temporal Extent:** {_g('start_temporal_extent', 'N/A')} - {_g('end_temporal_extent', 'N/A')}<br />
+    **Temporal Resolution:** {(_g('temporal_resolution') or ['N/A'])[0]}<br />
+    **Spatial Extent:** {(_g('spatial_extent') or ['N/A'])[0]}<br />
+    **Spatial Resolution:** {(_g('spatial_resolution') or ['N/A'])[0]}<br />
+    **Data Type:** {(_g('data_type') or ['N/A'])[0]}<br />
+    **Data Latency:** {(_g('data_latency') or ['N/A'])[0]}<br />
   </Prose>
 </Block>\n\n"""
 
@@ -42,9 +82,17 @@ def format_prose_block(content, header=None):
         str: Formatted MDX prose block with consistent indentation.
     """
 
+    # Nothing to format for a missing or empty section.
+    body = content.get(header) or ""
+    if not body:
+        return ""
+
+    # splitlines() is a single C call with no empty tail entry to filter, and
+    # the nested generators feed join without materializing a line list.
+    # Ensure all paragraphs have uniform indentation.
     formatted_paragraphs = "\n\n".join(
-        f"    {line.strip()}" for line in content[header].split("\n") if line.strip()
-    )  # Ensure all paragraphs have uniform indentation
+        f"    {s}" for s in (line.strip() for line in body.splitlines()) if s
+    )
 
     if header != 'Introduction paragraph':
         return f"""\
@@ -76,25 +124,19 @@ def _build_media_block(media_data_list):
     Returns:
         dict: A dictionary representing the structured media block.
     """
-    src_val = None  # Default to None if no main_media_image is found
-    alt_text = "Data not provided"
-    author_name = "Data not provided"
-    author_url = "Data not provided"
-
-    if isinstance(media_data_list, list):
-        for item in media_data_list:
-            # Check for main image source
-            if item.get('main_media_image'):
-                src_val = f"::file {item['main_media_image']}" # Format as MDX file link
-            # Check for alt text
-            if item.get('main_fig_alt_text'):
-                alt_text = item['main_fig_alt_text']
-            # Check for author name
-            if item.get('main_fig_author_name'):
-                author_name = item['main_fig_author_name']
-            # Check for author URL
-            if item.get('main_fig_author_URL'):
-                author_url = item['main_fig_author_URL']
+    items = media_data_list if isinstance(media_data_list, list) else ()
+
+    # Each field takes the first item that provides it, so the scan stops at
+    # the first hit (the common case: the first item carries the value).
+    # Image source formatted as an MDX file link; None if not found.
+    src_val = next((f"::file {item['main_media_image']}" for item in items
+                    if item.get('main_media_image')), None)
+    alt_text = next((item['main_fig_alt_text'] for item in items
+                     if item.get('main_fig_alt_text')), "Data not provided")
+    author_name = next((item['main_fig_author_name'] for item in items
+                        if item.get('main_fig_author_name')), "Data not provided")
+    author_url = next((item['main_fig_author_URL'] for item in items
+                       if item.get('main_fig_author_URL')), "Data not provided")
 
     return {
         "src": src_val,  # This can be None if no image is specified
@@ -117,21 +159,16 @@ def _build_taxonomy_block(tags_data_list):
     Returns:
         list: A list of dictionaries, each representing a taxonomy category.
     """
-    topics = []
-    subtopics = []
-    source = "Data not provided" # Default source
-
-    if isinstance(tags_data_list, list):
-        for item in tags_data_list:
-            # Extract and clean topics (comma-separated string to list of strings)
-            if item.get('topic'):
-                topics = [t.strip() for t in item['topic'].split(",") if t.strip()]
-            # Extract and clean subtopics
-            if item.get('subtopic'):
-                subtopics = [st.strip() for st in item['subtopic'].split(",") if st.strip()]
-            # Extract source
-            if item.get('source'):
-                source = item['source']
+    items = tags_data_list if isinstance(tags_data_list, list) else ()
+
+    # Take the first item carrying each field, short-circuiting the scan.
+    topic_str = next((item['topic'] for item in items if item.get('topic')), None)
+    subtopic_str = next((item['subtopic'] for item in items if item.get('subtopic')), None)
+    source = next((item['source'] for item in items if item.get('source')), "Data not provided")
+
+    # Clean topics/subtopics (comma-separated string to list of strings).
+    topics = [t.strip() for t in topic_str.split(",") if t.strip()] if topic_str else []
+    subtopics = [st.strip() for st in subtopic_str.split(",") if st.strip()] if subtopic_str else []
 
     return [
         {"name": "Topics", "values": topics if topics else ["Data not provided"]}, # Default if no topics
@@ -152,24 +189,52 @@ def construct_non_prose_section(table_0, table_1, content, hex_or_rgb):
     Returns:
         dict: A dictionary representing the complete YAML frontmatter.
     """
+    # Description: backslash escapes (e.g. \n) are only interpreted when
+    # present, so the common case skips the JSON parser entirely. Quotes are
+    # escaped before parsing and a failed parse keeps the raw text, instead of
+    # crashing on an unescaped '"' like the old json.loads(f'"{...}"') did.
+    description = table_0.get("description", "") or ""
+    if "\\" in description:
+        try:
+            description = json.loads('"' + description.replace('"', '\\"') + '"')
+        except ValueError:
+            pass # Keep the raw text if the escapes don't parse.
+
+    # Fetch each table_1 field once into a local: the same keys feed the
+    # infoDescription block here and the per-layer info dicts below, and
+    # `or ['N/A']` only allocates the fallback list when the value is missing.
+    _g = table_1.get
+    temporal_resolution = (_g('temporal_resolution') or ['N/A'])[0]
+    spatial_extent = (_g('spatial_extent') or ['N/A'])[0]
+    spatial_resolution = (_g('spatial_resolution') or ['N/A'])[0]
+    data_units = (_g('data_units') or ['N/A'])[0]
+    data_type = (_g('data_type') or ['N/A'])[0]
+    data_latency = (_g('data_latency') or ['N/A'])[0]
+
+    # The per-layer info dict repeats the same four table_1 fields for every
+    # layer; normalize them once here instead of once per layer.
+    info_source = str((_g('content_source') or ["Data not provided"])[0]).strip()
+    info_spatial_extent = str((_g('spatial_extent') or ["Data not provided"])[0]).strip()
+    info_temporal_resolution = str((_g('temporal_resolution') or ["Data not provided"])[0]).strip()
+    info_unit = str((_g('data_units') or ["Data not provided"])[0]).strip()
+
     # Assemble the main output dictionary for YAML frontmatter
     output = {
         "id": table_0.get("id"),  # Unique identifier for the dataset
         "name": table_0.get("name"), # Name of the dataset
-        # Description, processed via json.loads to handle potential special characters
-        "description": json.loads(f'"{table_0.get("description","")}"'),
+        "description": description,
         "media": _build_media_block(table_0.get("media", [])), # Structured media information
         "taxonomy": _build_taxonomy_block(table_0.get("tags", [])), # Structured taxonomy information
         # Markdown formatted string for various informational details
         "infoDescription": PreservedScalarString(f"""\
     ::markdown 
-        - Temporal Extent: {table_1.get('start_temporal_extent', 'N/A')} - {table_1.get('end_temporal_extent', 'N/A')}
-        - Temporal Resolution: {table_1.get('temporal_resolution', ['N/A'])[0]}
-        - Spatial Extent: {table_1.get('spatial_extent', ['N/A'])[0]}
-        - Spatial Resolution: {table_1.get('spatial_resolution', ['N/A'])[0]}
-        - Data Units: {table_1.get('data_units', ['N/A'])[0]}
-        - Data Type: {table_1.get('data_type', ['N/A'])[0]}
-        - Data Latency: {table_1.get('data_latency', ['N/A'])[0]}
+        - Temporal Extent: {_g('start_temporal_extent', 'N/A')} - {_g('end_temporal_extent', 'N/A')}
+        - Temporal Resolution: {temporal_resolution}
+        - Spatial Extent: {spatial_extent}
+        - Spatial Resolution: {spatial_resolution}
+        - Data Units: {data_units}
+        - Data Type: {data_type}
+        - Data Latency: {data_latency}
     """.strip()) # .strip() to prevent YAML artifacts from leading/trailing whitespace
     }
 
@@ -184,61 +249,50 @@ def construct_non_prose_section(table_0, table_1, content, hex_or_rgb):
 
     parsed_layers = table_0.get("layers", []) # Get layer data from table_0, default to empty list
 
+    # Bind the helpers once outside the loop: the per-layer body calls them
+    # ~15 times each through module globals otherwise, and LOAD_FAST locals
+    # skip that dictionary lookup on every call.
+    clean = _clean
+    safe_float = _safe_float
+
     # Iterate through each layer parsed from the input document
     for i, layer_container_dict in enumerate(parsed_layers):
         actual_layer_data = layer_container_dict.get(f"Layer{i}")
         if not actual_layer_data: # Skip if no data for this layer index
             continue
 
-        # --- Helper function to safely convert string values to float ---
-        def safe_float(value_str):
-            """
-            Safely converts a string value to a float, handling various non-numeric
-            placeholders like "Data not provided", "None", etc.
-            Returns None if conversion is not possible or input is a placeholder.
-            """
-            if isinstance(value_str, (int, float)): # Already a number
-                return float(value_str)
-            if isinstance(value_str, str):
-                value_str_cleaned = value_str.strip().lower()
-                # Check for common placeholder strings
-                if value_str_cleaned and value_str_cleaned not in ["data not provided", "none", "null", ""]:
-                    try:
-                        return float(value_str.strip()) # Use original case for float conversion
-                    except ValueError:
-                        return None # Conversion failed
-            return None # Not a string or is a placeholder
+        # Bound method saves one attribute lookup per field fetched below.
+        layer_get = actual_layer_data.get
 
         # --- Extract and process layer parameters ---
-        rescale_min_val = safe_float(actual_layer_data.get(f"rescale_min{i}"))
-        rescale_max_val = safe_float(actual_layer_data.get(f"rescale_max{i}"))
+        rescale_min_val = safe_float(layer_get("rescale_min"))
+        rescale_max_val = safe_float(layer_get("rescale_max"))
 
         # Build sourceParams dictionary conditionally
         source_params = {}
-        colormap_val = actual_layer_data.get(f"colormap_name{i}")
-        if colormap_val and str(colormap_val).strip().lower() not in ["data not provided", "none", "null", ""]:
-            source_params["colormap_name"] = verify.check_if_colormap_is_valid(str(colormap_val).strip())
+        colormap_val = clean(layer_get("colormap_name"))
+        if colormap_val is not None:
+            source_params["colormap_name"] = verify.check_if_colormap_is_valid(colormap_val)
 
-        resampling_val = actual_layer_data.get(f"resampling{i}")
-        if resampling_val and str(resampling_val).strip().lower() not in ["data not provided", "none", "null", ""]:
-            source_params["resampling"] = str(resampling_val).strip()
+        resampling_val = clean(layer_get("resampling"))
+        if resampling_val is not None:
+            source_params["resampling"] = resampling_val
 
         if rescale_min_val is not None and rescale_max_val is not None:
             source_params["rescale"] = [rescale_min_val, rescale_max_val]
 
         # Build legend_dict conditionally
         legend_dict = {}
-        legend_units = actual_layer_data.get(f"units{i}")
-        legend_type = actual_layer_data.get(f"legend_type{i}")
-        legend_min_val = safe_float(actual_layer_data.get(f"legend_minimum{i}"))
-        legend_max_val = safe_float(actual_layer_data.get(f"legend_maximum{i}"))
-        color_stops_data = actual_layer_data.get(f'color_stops{i}', [])
+        legend_units = clean(layer_get("units"))
+        legend_type_str = clean(layer_get("legend_type"))
+        legend_min_val = safe_float(layer_get("legend_minimum"))
+        legend_max_val = safe_float(layer_get("legend_maximum"))
+        color_stops_data = layer_get('color_stops', [])
 
-        if legend_units and str(legend_units).strip().lower() not in ["data not provided", "none", "null", ""]:
-            legend_dict["unit"] = {"label": str(legend_units).strip()}
+        if legend_units is not None:
+            legend_dict["unit"] = {"label": legend_units}
 
-        if legend_type and str(legend_type).strip().lower() not in ["data not provided", "none", "null", ""]:
-            legend_type_str = str(legend_type).strip()
+        if legend_type_str is not None:
             legend_dict["type"] = legend_type_str
             if legend_type_str == 'gradient': # Min/max only relevant for gradient legends
                 if legend_min_val is not None:
@@ -249,7 +303,7 @@ def construct_non_prose_section(table_0, table_1, content, hex_or_rgb):
         if isinstance(color_stops_data, list) and color_stops_data:
             processed_stops = []
             for stop_color in color_stops_data:
-                if not stop_color or str(stop_color).strip().lower() in ["data not provided", "none", "null", ""]:
+                if clean(stop_color) is None:
                     continue # Skip invalid or placeholder color stops
                 try:
                     # Convert color to the specified format (rgb or hex)
@@ -264,29 +318,17 @@ def construct_non_prose_section(table_0, table_1, content, hex_or_rgb):
                 legend_dict["stops"] = processed_stops
 
         # Build projection_dict conditionally
-        projection_id_val = actual_layer_data.get(f"projection{i}")
+        projection_id_val = clean(layer_get("projection"))
         projection_dict = {}
-        if projection_id_val and str(projection_id_val).strip().lower() not in ["data not provided", "none", "null", ""]:
-            projection_dict["id"] = verify.check_if_projection_is_valid(str(projection_id_val).strip())
-
-        # --- Helper function to get cleaned string values or None ---
-        def get_str_val_or_none(key_name):
-            """
-            Retrieves a string value for a given key from actual_layer_data,
-            strips it, and returns None if it's a placeholder or empty.
-            Appends the layer index 'i' to the key_name.
-            """
-            val = actual_layer_data.get(f"{key_name}{i}")
-            if val and str(val).strip().lower() not in ["data not provided", "none", "null", ""]:
-                return str(val).strip()
-            return None
-
-        # Extract basic layer string properties using the helper
-        layer_id = get_str_val_or_none("layer_id")
-        stac_col = get_str_val_or_none("stacCol")
-        layer_name = get_str_val_or_none("layer_name")
-        data_format_val = get_str_val_or_none("data_format")
-        layer_description = get_str_val_or_none("layer_description")
+        if projection_id_val is not None:
+            projection_dict["id"] = verify.check_if_projection_is_valid(projection_id_val)
+
+        # Extract basic layer string properties via the module-level cleaner
+        layer_id = clean(layer_get("layer_id"))
+        stac_col = clean(layer_get("stacCol"))
+        layer_name = clean(layer_get("layer_name"))
+        data_format_val = clean(layer_get("data_format"))
+        layer_description = clean(layer_get("layer_description"))
 
         main_dataset_id = str(table_0.get("id","")).strip()
         compare_layer_id = layer_id if layer_id else main_dataset_id # Fallback for compare layerId
@@ -306,11 +348,11 @@ def construct_non_prose_section(table_0, table_1, content, hex_or_rgb):
                 "layerId": compare_layer_id,
                 "mapLabel": PreservedScalarString(MAP_LABEL_JS_CODE) # Use predefined JS code
             },
-            "info": { # Extract info from table_1, providing defaults
-                "source": str(table_1.get('content_source', ["Data not provided"])[0]).strip(),
-                "spatialExtent": str(table_1.get('spatial_extent', ["Data not provided"])[0]).strip(),
-                "temporalResolution": str(table_1.get('temporal_resolution', ["Data not provided"])[0]).strip(),
-                "unit": str(table_1.get('data_units', ["Data not provided"])[0]).strip()
+            "info": { # Reuse the info strings computed once before the loop
+                "source": info_source,
+                "spatialExtent": info_spatial_extent,
+                "temporalResolution": info_temporal_resolution,
+                "unit": info_unit
             },
             "media": { # Placeholder media block for layers
                 "src": "::file <INSERT MANUALLY>",
@@ -318,20 +360,16 @@ def construct_non_prose_section(table_0, table_1, content, hex_or_rgb):
             }
         }
 
-        # Conditionally add non-empty dictionaries
+        # Conditionally add non-empty dictionaries; empty ones are never
+        # inserted, so no follow-up deletion pass is needed.
         if source_params: layer_to_append["sourceParams"] = source_params
         if legend_dict: layer_to_append["legend"] = legend_dict
         if projection_dict: layer_to_append["projection"] = projection_dict
 
-        # Clean the assembled layer: remove keys with None, empty string, or empty dict values.
-        layer_to_append_cleaned = {k: v for k, v in layer_to_append.items() if v is not None and v != "" and v != {}}
-        # Further ensure that if optional blocks like sourceParams are empty they are removed
-        if "sourceParams" in layer_to_append_cleaned and not layer_to_append_cleaned["sourceParams"]:
-             del layer_to_append_cleaned["sourceParams"]
-        if "legend" in layer_to_append_cleaned and not layer_to_append_cleaned["legend"]:
-             del layer_to_append_cleaned["legend"]
-        if "projection" in layer_to_append_cleaned and not layer_to_append_cleaned["projection"]:
-             del layer_to_append_cleaned["projection"]
+        # Clean the assembled layer in one pass: drop keys whose values are
+        # None, empty strings, or empty containers.
+        layer_to_append_cleaned = {k: v for k, v in layer_to_append.items()
+                                   if v not in (None, "", {}, [])}
 
         # Only append the layer if it has an 'id' after cleaning.
         if layer_to_append_cleaned.get("id"):
@@ -1,27 +1,37 @@
 #!/usr/bin/env python3
 
+import functools
+import io
+import json
 import os
 import re
-from ruamel.yaml import YAML
-from ruamel.yaml.scalarstring import PreservedScalarString
+import sys
 
-def get_yaml_instance():
+
+class PreservedScalarString(str):
     """
-    Returns a configured instance of the YAML parser.
+    Marks a string for emission as a YAML literal block scalar (``|``).
 
-    Returns:
-        YAML: Configured YAML instance.
+    Plain str subclass standing in for ruamel's class of the same name:
+    the registered representer is all that is needed to get the literal
+    block style out of PyYAML, so the ruamel dependency is gone from the
+    emit path.
     """
-    yaml = YAML()
-    yaml.indent(mapping=2, sequence=4, offset=2)
-    yaml.preserve_quotes = True  # Ensures YAML formatting is preserved
-    yaml.representer.add_representer(PreservedScalarString, literal_presenter)
-    return yaml
+    __slots__ = ()
+
 
+# Matches "rgb(R, G, B)" strings: three groups of 1-3 digits with optional
+# spaces around the commas. Compiled once — color_converter runs per color stop.
+_RGB_RE = re.compile(r"rgb\((\d{1,3}),\s*(\d{1,3}),\s*(\d{1,3})\)")
+
+@functools.lru_cache(maxsize=512)
 def color_converter(color, hex_or_rgb="rgb"):
     """
     Converts a hex color code to an RGB tuple, or vice versa.
 
+    Results are memoized per (color, format): palettes are typically reused
+    across layers, so identical color strings are only parsed once.
+
     Args:
         color (str or tuple): Hex color string in the format "#RRGGBB" or "RRGGBB",
                               or an RGB tuple (R, G, B).
@@ -39,8 +49,7 @@ def color_converter(color, hex_or_rgb="rgb"):
             return f"#{color[0]:02X}{color[1]:02X}{color[2]:02X}" # Convert to HEX.
 
     # Case 2: Input is an RGB string (e.g., "rgb(255, 0, 0)" or "rgb(255,0,0)").
-    # Regex captures three groups of 1-3 digits, allowing for optional spaces around commas.
-    rgb_match = re.match(r"rgb\((\d{1,3}),\s*(\d{1,3}),\s*(\d{1,3})\)", str(color))
+    rgb_match = _RGB_RE.match(str(color))
     if rgb_match:
         rgb_tuple = tuple(map(int, rgb_match.groups())) # Convert captured groups to integers.
         if hex_or_rgb == "rgb":
@@ -50,13 +59,22 @@ def color_converter(color, hex_or_rgb="rgb"):
 
     # Case 3: Input is a HEX string (e.g., "#FF0000" or "FF0000").
     hex_color_str = str(color).lstrip("#").upper()  # Remove '#' and convert to uppercase for consistent processing.
-    if len(hex_color_str) == 6 and all(c in "0123456789ABCDEF" for c in hex_color_str): # Validate hex format.
-        if hex_or_rgb == "hex":
-            return f"#{hex_color_str}" # Return normalized HEX if HEX is requested.
-        else:
-            # Convert HEX to RGB tuple.
-            rgb_tuple = tuple(int(hex_color_str[i:i+2], 16) for i in (0, 2, 4))
-            return rgb_tuple
+    if len(hex_color_str) == 6 and hex_color_str.isascii() and hex_color_str.isalnum():
+        # int() validates and parses the six digits in one C-level call, but
+        # also tolerates signs, underscores, surrounding whitespace and
+        # non-ASCII digits (e.g. Arabic-Indic), so the isascii()/isalnum()
+        # gate rejects those first; a failed parse falls through to the
+        # invalid-format error below.
+        try:
+            value = int(hex_color_str, 16)
+        except ValueError:
+            value = None
+        if value is not None:
+            if hex_or_rgb == "hex":
+                return f"#{hex_color_str}" # Return normalized HEX if HEX is requested.
+            # Convert HEX to RGB tuple by extracting the three 8-bit lanes,
+            # instead of slicing and re-parsing two characters at a time.
+            return ((value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF)
 
     # If none of the above cases match, the format is invalid.
     raise ValueError("Invalid color format. Must be RGB (rgb(R,G,B) or (R,G,B)) or HEX (#RRGGBB or RRGGBB)")
@@ -73,7 +91,142 @@ def literal_presenter(dumper, data):
     Returns:
         YAML scalar string.
     """
-    return dumper.represent_scalar('tag:yaml.org,2002:str', data, style='|')
+    # Line-trailing whitespace makes the literal block style unrepresentable
+    # and PyYAML silently falls back to an escaped quoted scalar, so strip it
+    # first. str() because the libyaml C emitter rejects str subclasses.
+    return dumper.represent_scalar('tag:yaml.org,2002:str',
+                                   _TRAIL_WS.sub("", str(data)), style='|')
+
+
+# PyYAML's libyaml-backed dumper emits in C; use it when the extension is
+# available and fall back to PyYAML's pure-Python SafeDumper otherwise. The
+# registered representer handles the literal block scalars on both.
+from yaml import dump as _pyyaml_dump
+try:
+    from yaml import CSafeDumper as _YamlDumper
+    _HAS_LIBYAML = True
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
+    _HAS_LIBYAML = False
+_YamlDumper.add_representer(PreservedScalarString, literal_presenter)
+
+
+def _has_literal_scalars(value):
+    """
+    Recursively checks whether any value is a PreservedScalarString, which
+    needs the literal block style only a YAML emitter can produce.
+    """
+    if isinstance(value, PreservedScalarString):
+        return True
+    if isinstance(value, dict):
+        return any(_has_literal_scalars(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_literal_scalars(v) for v in value)
+    return False
+
+
+def dump_yaml_fast(data, stream):
+    """
+    Dumps YAML to a stream using PyYAML's C backend when available.
+
+    Without libyaml, data free of PreservedScalarString block literals is
+    emitted with json.dump (JSON is a subset of YAML 1.2, and the json module
+    runs in C); anything needing literal block style goes through PyYAML's
+    pure-Python SafeDumper with the same representer.
+
+    Args:
+        data (dict): Data to serialize.
+        stream: File-like object to write to.
+    """
+    if not _HAS_LIBYAML and not _has_literal_scalars(data):
+        json.dump(data, stream, indent=2, ensure_ascii=False)
+        stream.write("\n")
+    else:
+        _pyyaml_dump(data, stream, Dumper=_YamlDumper, sort_keys=False,
+                     allow_unicode=True, default_flow_style=False)
+
+
+# Prefix tagging PreservedScalarString values inside the canonical JSON form
+# of a frontmatter dict; NUL cannot appear in DOCX-extracted text, so the
+# marker never collides with real content.
+_PSS_TAG = "\x00literal\x00"
+
+
+def _tag_literals(value):
+    """
+    Returns a copy of value with PreservedScalarString instances replaced by
+    tag-prefixed plain strings, so the literal style survives the JSON
+    round-trip used for the cache key.
+    """
+    if isinstance(value, PreservedScalarString):
+        return _PSS_TAG + str(value)
+    if isinstance(value, dict):
+        return {k: _tag_literals(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_tag_literals(v) for v in value]
+    return value
+
+
+def _untag_literals(value):
+    """
+    Inverse of _tag_literals: restores PreservedScalarString for tag-prefixed
+    strings after json.loads.
+    """
+    if isinstance(value, str):
+        if value.startswith(_PSS_TAG):
+            return PreservedScalarString(value[len(_PSS_TAG):])
+        return value
+    if isinstance(value, dict):
+        return {k: _untag_literals(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_untag_literals(v) for v in value]
+    return value
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_yaml_dump(canon):
+    """
+    Emits YAML for a frontmatter dict given its canonical JSON form.
+
+    The JSON string doubles as the cache key (dicts are not hashable) and as
+    the payload: it is parsed back, its tagged literal scalars restored, and
+    fed through dump_yaml_fast, so repeated identical frontmatter across a
+    batch is only emitted once.
+
+    Args:
+        canon (str): json.dumps of the _tag_literals form of the frontmatter.
+
+    Returns:
+        str: The emitted YAML text.
+    """
+    out = io.StringIO()
+    dump_yaml_fast(_untag_literals(json.loads(canon)), out)
+    return out.getvalue()
+
+
+def dump_yaml_cached(data, stream):
+    """
+    Like dump_yaml_fast, but memoizes the emitted YAML for identical dicts.
+
+    Batch runs often share taxonomy/media defaults across files, so identical
+    frontmatter is emitted once and replayed from the cache.
+    PreservedScalarString values are tag-encoded into the canonical key and
+    reconstructed inside the cached emitter, so the literal block style
+    survives and real frontmatter (which always carries them) can hit the
+    cache. Data that cannot be canonicalized falls through to the direct
+    emitter.
+
+    Args:
+        data (dict): Data to serialize.
+        stream: File-like object to write to.
+    """
+    try:
+        canon = json.dumps(_tag_literals(data), sort_keys=False)
+    except (TypeError, ValueError):
+        dump_yaml_fast(data, stream) # Not canonicalizable; emit directly.
+        return
+    stream.write(_cached_yaml_dump(canon))
+
 
 def convert_docx_to_mdx_path(docx_path):
     """
@@ -91,54 +244,90 @@ def convert_docx_to_mdx_path(docx_path):
     new_filename = re.sub(r"\.docx$", ".data.mdx", filename)  # Replace .docx with .data.mdx
     return os.path.join(out_dir, new_filename)
 
-def save_mdx_content(outfile, mdx_content_string):
+def save_mdx_content(outfile, mdx_content):
     """
-    Saves the fully formed MDX content string to a file.
+    Saves MDX content to a file, stripping trailing whitespace as it writes.
+
+    Accepting the parts iterable directly avoids materializing the full MDX
+    document as one string and the read-back cleanup pass that used to follow.
 
     Args:
         outfile (str): Output file path.
-        mdx_content_string (str): The complete MDX content.
+        mdx_content (str or iterable of str): The complete MDX content, or
+            the parts it is assembled from, written in order.
 
     Returns:
         int: 0 on success.
     """
+    if isinstance(mdx_content, str):
+        mdx_content = (mdx_content,)
     with open(outfile, "w", encoding="utf-8") as file:
         print(f"Writing file: {outfile}")
-        file.write(mdx_content_string)
+        for part in mdx_content:
+            file.write(strip_trailing_whitespace_string(part))
     return 0
 
 
-def debug_mdx_file(mdx_file_path):
+def debug_mdx_string(mdx_content_string):
     """
-    Reads the file and prints its content to debug the presence of '|2-' or other anomalies.
+    Prints MDX content to debug the presence of '|2-' or other anomalies.
+    Operates on the in-memory string; output is collected and written in one
+    buffered stdout call instead of one print (and flush) per line.
     """
-    with open(mdx_file_path, "r", encoding="utf-8") as file:
-        content = file.readlines()  # Read all lines
+    content = mdx_content_string.splitlines(keepends=True)
 
-    print("\n[DEBUG] FULL FILE CONTENT (showing raw formatting):")
-    for i, line in enumerate(content, start=1):
-        print(f"{i}: {repr(line)}")  # Show raw representation including spaces and escape sequences
+    out = ["\n[DEBUG] FULL FILE CONTENT (showing raw formatting):\n"]
+    # Show raw representation including spaces and escape sequences.
+    out.extend(f"{i}: {repr(line)}\n" for i, line in enumerate(content, start=1))
 
-    print("\n[DEBUG] Searching for '|2-' occurrences:")
+    out.append("\n[DEBUG] Searching for '|2-' occurrences:\n")
     problematic_lines = [line for line in content if "|2-" in line]
 
     if problematic_lines:
-        for line in problematic_lines:
-            print(f"Found: {repr(line)}")
+        out.extend(f"Found: {repr(line)}\n" for line in problematic_lines)
     else:
-        print("No '|2-' found. The issue might be elsewhere.")
+        out.append("No '|2-' found. The issue might be elsewhere.\n")
+
+    sys.stdout.write("".join(out))
+
+
+def debug_mdx_file(mdx_file_path):
+    """
+    Reads the file and prints its content to debug the presence of '|2-' or other anomalies.
+    """
+    with open(mdx_file_path, "r", encoding="utf-8") as file:
+        debug_mdx_string(file.read())
+
+
+# Trailing spaces/tabs at end of line, across the whole buffer in one C-level sub.
+_TRAIL_WS = re.compile(r"[ \t]+$", re.MULTILINE)
+
+
+def strip_trailing_whitespace_string(text):
+    """
+    Removes trailing whitespace from each line of an in-memory string.
+
+    Args:
+        text (str): Text to clean.
+
+    Returns:
+        str: Text with trailing whitespace stripped from every line, ending
+        with a newline.
+    """
+    text = _TRAIL_WS.sub("", text)
+    # Preserve the guarantee that cleaned output ends with a newline.
+    if text and not text.endswith("\n"):
+        text += "\n"
+    return text
 
 
 def remove_trailing_whitespace(file_path):
     """Removes trailing whitespace from each line in the specified file."""
     print('Removing whitespaces after each line')
     with open(file_path, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-
-    # Strip trailing whitespace from each line and ensure a newline character at the end.
-    cleaned_lines = [line.rstrip() + "\n" for line in lines]
+        text = f.read()
 
     with open(file_path, "w", encoding="utf-8") as f:
-        f.writelines(cleaned_lines)
+        f.write(strip_trailing_whitespace_string(text))
 
     print(f"\n✅ {file_path} complete.")
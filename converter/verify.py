@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 
-def check_if_colormap_is_valid(colormap):
-    #Pulled from https://github.com/NASA-IMPACT/veda-config/blob/develop/admin/config.yml
-    valid_colors = ["accent","accent_r","afmhot","afmhot_r","autumn","autumn_r","binary","binary_r","blues","blues_r",
+#Pulled from https://github.com/NASA-IMPACT/veda-config/blob/develop/admin/config.yml
+# Module-level frozensets: built once at import, O(1) membership checks instead
+# of re-allocating a ~170-element list and scanning it on every call.
+_VALID_COLORMAPS = frozenset(["accent","accent_r","afmhot","afmhot_r","autumn","autumn_r","binary","binary_r","blues","blues_r",
                     "bone","bone_r","brbg","brbg_r","brg","brg_r","bugn","bugn_r","bupu","bupu_r","bwr","bwr_r",
                     "cfastie","cividis","cividis_r","cmrmap","cmrmap_r","cool","cool_r","coolwarm","coolwarm_r",
                     "copper","copper_r","cubehelix","cubehelix_r","dark2","dark2_r","flag","flag_r","gist_earth",
@@ -19,18 +20,22 @@ def check_if_colormap_is_valid(colormap):
                     "spring","spring_r","summer","summer_r","tab10","tab10_r","tab20","tab20_r","tab20b","tab20b_r",
                     "tab20c","tab20c_r","terrain","terrain_r","twilight","twilight_r","twilight_shifted","twilight_shifted_r",
                     "viridis","viridis_r","winter","winter_r","wistia","wistia_r","ylgn","ylgn_r","ylgnbu","ylgnbu_r",
-                    "ylorbr","ylorbr_r","ylorrd","ylorrd_r",None]
-    if colormap not in valid_colors:
-        raise ValueError(f"Invalid colormap: {colormap}. \n\nPlease choose from the list of {valid_colors}.")
+                    "ylorbr","ylorbr_r","ylorrd","ylorrd_r",None])
+
+_VALID_PROJECTIONS = frozenset(["albers","equalEarth","equirectangular","lambertConformalConic","mercator","naturalEarth","winkelTripel",
+                      "globe","polarNorth","polarSouth"])
+
+
+def check_if_colormap_is_valid(colormap):
+    # The valid names are all lowercase; normalize here so callers don't have to.
+    if isinstance(colormap, str):
+        colormap = colormap.lower()
+    if colormap not in _VALID_COLORMAPS:
+        raise ValueError(f"Invalid colormap: {colormap}. \n\nPlease choose from the list of {sorted(c for c in _VALID_COLORMAPS if c)}.")
     return colormap
 
-        
-    
 
 def check_if_projection_is_valid(projection):
-    #Pulled from https://github.com/NASA-IMPACT/veda-config/blob/develop/admin/config.yml
-    valid_projection = ["albers","equalEarth","equirectangular","lambertConformalConic","mercator","naturalEarth","winkelTripel",
-                      "globe","polarNorth","polarSouth",]
-    if projection not in valid_projection:
-        raise ValueError(f"Invalid projection: {projection}. Please choose from the list of {valid_projection}.")
-    return projection   
\ No newline at end of file
+    if projection not in _VALID_PROJECTIONS:
+        raise ValueError(f"Invalid projection: {projection}. Please choose from the list of {sorted(_VALID_PROJECTIONS)}.")
+    return projection
@@ -4,10 +4,6 @@ from converter import utils
 from converter import prose
 import sys
 import os
-import yaml
-from ruamel.yaml import YAML
-from ruamel.yaml.scalarstring import PreservedScalarString
-import re
 
 #Testing data
 # docx_path = "template/test_LIS.docx" # Example filename for testing
@@ -32,45 +28,43 @@ if __name__ == '__main__':
 
     outfile = utils.convert_docx_to_mdx_path(docx_path)
 
-    # --- Assemble MDX content ---
-    mdx_parts = []
+    # --- Stream the MDX content straight to the output file ---
+    # The file is opened once; the YAML frontmatter is dumped directly to the
+    # handle (no StringIO round-trip) and each prose block is written as it is
+    # produced, so the full document is never materialized in memory.
+    strip = utils.strip_trailing_whitespace_string
+    with open(outfile, "w", encoding="utf-8") as fh:
+        print(f"Writing file: {outfile}")
 
-    # 1. Add YAML frontmatter
-    yaml_instance = utils.get_yaml_instance()
-    import io
-    string_stream = io.StringIO()
-    yaml_instance.dump(output, string_stream)
-    frontmatter_yaml = f"---\n{string_stream.getvalue()}---\n\n"
-    mdx_parts.append(frontmatter_yaml)
+        # 1. YAML frontmatter (libyaml C backend when available; the
+        # PreservedScalarString fields keep their literal block style either way)
+        fh.write("---\n")
+        utils.dump_yaml_cached(output, fh)
+        fh.write("---\n\n")
 
-    # 2. Add MDX content headers (e.g., dataset summary block)
-    mdx_parts.append(prose.generate_mdx_content_headers(table_1))
+        # 2. MDX content headers (e.g., dataset summary block)
+        fh.write(strip(prose.generate_mdx_content_headers(table_1)))
 
-    # 3. Add REQUIRED TOP prose blocks (Introduction, Citation, etc.)
-    for header in orderTOP:
-        if header in prose_content: # Check if the prose section exists in the parsed data
-            mdx_parts.append(prose.format_prose_block(prose_content, header))
+        # 3. REQUIRED TOP prose blocks (Introduction, Citation, etc.)
+        for header in orderTOP:
+            if header in prose_content: # Check if the prose section exists in the parsed data
+                fh.write(strip(prose.format_prose_block(prose_content, header)))
 
-    # 4. Add OPTIONAL prose blocks found in table_optional
-    if len(table_optional) > 0:
-        for k,v in table_optional.items():
-            # Assuming table_optional stores a list of dictionaries,
-            # and each dictionary has the prose content under its key.
-            # Example: table_optional = {"Optional Section": [{"Optional Section": "Content..."}]}
-            # The key_ extraction might need adjustment based on actual structure.
-            if isinstance(table_optional[k], list) and len(table_optional[k]) > 0 and isinstance(table_optional[k][0], dict):
-                key_ = list(table_optional[k][0].keys())[0] # Get the actual header name
-                mdx_parts.append(prose.format_prose_block(table_optional[k][0], key_))
+        # 4. OPTIONAL prose blocks found in table_optional
+        # table_optional stores a list of dictionaries, and each dictionary has
+        # the prose content under its key.
+        # Example: table_optional = {"Optional Section": [{"Optional Section": "Content..."}]}
+        for k, v in table_optional.items():
+            if v and isinstance(v, list) and isinstance(v[0], dict):
+                d = v[0]
+                fh.write(strip(prose.format_prose_block(d, next(iter(d)))))
 
-    # 5. Add REQUIRED BOTTOM prose blocks (Disclaimer, License, etc.)
-    for header in orderBOTTOM:
-        if header in prose_content: # Check if the prose section exists
-            mdx_parts.append(prose.format_prose_block(prose_content, header))
+        # 5. REQUIRED BOTTOM prose blocks (Disclaimer, License, etc.)
+        for header in orderBOTTOM:
+            if header in prose_content: # Check if the prose section exists
+                fh.write(strip(prose.format_prose_block(prose_content, header)))
 
-    # --- Save the final MDX file ---
-    final_mdx_content = "".join(mdx_parts) # Combine all parts into a single string
-    utils.save_mdx_content(outfile, final_mdx_content) # Save the complete MDX content
-
-    # --- Post-processing and debugging ---
-    utils.debug_mdx_file(outfile) # Output file content for debugging
-    utils.remove_trailing_whitespace(outfile)
+    # --- Debugging (the dump prints every line with repr() and is linear in
+    # file size, so only produce it when explicitly requested) ---
+    if os.environ.get("DOCX2MDX_DEBUG") == "1":
+        utils.debug_mdx_file(outfile) # Output file content for debugging